@@ -7,6 +7,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from collections import defaultdict
 from datetime import datetime
 import os
 
@@ -55,12 +56,17 @@ HOUSE_COLORS = {
     "Terra": "#95e1d3"     # Green
 }
 
+HOUSE_EMOJIS = {"Ignis": "🔥", "Nereus": "🌊", "Ventus": "💨", "Terra": "🌱"}
+
+# Medals for 1st-3rd place, indexed by position - 1
+MEDALS = ("🥇", "🥈", "🥉")
+
 # Data fetching functions
 @st.cache_data(ttl=30)  # Cache for 30 seconds
 def get_house_standings():
     """Get current house point standings"""
     try:
-        result = supabase.table("corrected_house_points").select("*").order("total_points", desc=True).execute()
+        result = supabase.table("corrected_house_points").select("house, total_points, individual_points, relay_team_points").order("total_points", desc=True).execute()
         return result.data or []
     except Exception as e:
         st.error(f"Error fetching house standings: {str(e)}")
@@ -70,7 +76,7 @@ def get_house_standings():
 def get_all_events():
     """Get all events"""
     try:
-        result = supabase.table("events").select("*").order("event_name").execute()
+        result = supabase.table("events").select("event_id, event_name, event_type, unit, is_relay").order("event_name").execute()
         return result.data or []
     except Exception as e:
         st.error(f"Error fetching events: {str(e)}")
@@ -81,9 +87,8 @@ def get_event_results(event_id):
     """Get results for a specific event"""
     try:
         result = supabase.table("results").select("""
-            *, 
-            students!inner(curtin_id, bib_id, first_name, last_name, house, gender),
-            events!inner(event_name, event_type, unit, is_relay)
+            result_id, result_value, position, points,
+            students!inner(bib_id, first_name, last_name, house)
         """).eq("event_id", event_id).order("position").execute()
         
         return result.data or []
@@ -157,10 +162,10 @@ def show_house_leaderboard():
         relay_points = house.get("relay_team_points", 0)
         
         # Medal emoji based on rank
-        medal = "🥇" if rank == 1 else "🥈" if rank == 2 else "🥉" if rank == 3 else "🏆"
+        medal = MEDALS[i] if i < len(MEDALS) else "🏆"
         
         # House emoji
-        house_emoji = {"Ignis": "🔥", "Nereus": "🌊", "Ventus": "💨", "Terra": "🌱"}.get(house_name, "🏠")
+        house_emoji = HOUSE_EMOJIS.get(house_name, "🏠")
         
         # Create colored container
         house_color = HOUSE_COLORS.get(house_name, "#ffffff")
@@ -236,9 +241,12 @@ def show_event_summaries():
         st.info("No completed events yet")
         return
     
-    # Group events by type
-    track_events = [e for e in events_with_results if e['event']['event_type'] == 'Track']
-    field_events = [e for e in events_with_results if e['event']['event_type'] == 'Field']
+    # Group events by type in one pass
+    events_by_type = defaultdict(list)
+    for event_data in events_with_results:
+        events_by_type[event_data['event']['event_type']].append(event_data)
+    track_events = events_by_type['Track']
+    field_events = events_by_type['Field']
     
     # Display by category
     if track_events:
@@ -277,7 +285,7 @@ def show_event_podium(event_data):
         
         for i, result in enumerate(podium_results):
             position = result.get('position', i + 1)
-            medal = "🥇" if position == 1 else "🥈" if position == 2 else "🥉"
+            medal = MEDALS[position - 1]  # podium_results only holds positions 1-3
             
             with cols[i]:
                 if is_relay:
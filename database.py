@@ -1,9 +1,15 @@
 """Updated Database operations with bib_id as primary key and gender-specific point allocation"""
 
 import os
-from typing import List, Dict, Optional
+import time
+import threading
+from copy import copy
+from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 import streamlit as st
 import logging
+from config import DEFAULT_INDIVIDUAL_POINTS_MALE, DEFAULT_INDIVIDUAL_POINTS_FEMALE, DEFAULT_RELAY_POINTS
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -12,11 +18,22 @@ logger = logging.getLogger(__name__)
 # Handle Supabase import gracefully
 try:
     from supabase import create_client, Client
+    from postgrest.exceptions import APIError
+    import httpx
     SUPABASE_AVAILABLE = True
 except ImportError:
     SUPABASE_AVAILABLE = False
+    APIError = Exception
+    httpx = None
     logger.error("Supabase not available")
 
+# HTTP/2 lets parallel reads share one connection; it needs the optional h2 package
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # Handle dotenv import gracefully
 try:
     from dotenv import load_dotenv
@@ -24,48 +41,274 @@ try:
 except ImportError:
     logger.info("python-dotenv not available, using environment variables directly")
 
+# PostgREST caps responses at 1000 rows by default, so large tables are read in pages
+PAGE_SIZE = 1000
+
+# Column lists for the wider reads, so each query only ships what its callers use
+PROJECTIONS = {
+    "result_detail": """
+        result_id, bib_id, event_id, result_value, position, points, house,
+        students!inner(bib_id, curtin_id, first_name, last_name, house, gender),
+        events!inner(event_name, event_type, unit, is_relay)
+    """,
+    # Many-to-one embeds come back as single objects, never lists
+    "result_recent": """
+        result_id, result_value, position, points,
+        students!inner(first_name, last_name), events!inner(event_name, unit)
+    """,
+    "result_ranking": "result_id, bib_id, event_id, house, result_value, position, points, students!inner(gender)",
+    "relay_scoring": "relay_male_points",
+    "relay_ranking": """
+        team_id, team_name, house, event_id,
+        member1_bib_id, member2_bib_id, member3_bib_id, member4_bib_id,
+        result_value, position, points
+    """,
+    "house_points": "house, total_points, individual_points, relay_team_points",
+    "athlete_performance": """
+        bib_id, curtin_id, first_name, last_name, house, gender,
+        individual_events, individual_points, individual_gold, individual_silver, individual_bronze,
+        total_individual_points, gender_rank, overall_rank
+    """,
+}
+
+# Default allocations with the string keys JSONB stores, built once at import
+_MALE_POINTS_JSON = {str(k): v for k, v in DEFAULT_INDIVIDUAL_POINTS_MALE.items()}
+_FEMALE_POINTS_JSON = {str(k): v for k, v in DEFAULT_INDIVIDUAL_POINTS_FEMALE.items()}
+_RELAY_POINTS_JSON = {str(k): v for k, v in DEFAULT_RELAY_POINTS.items()}
+
+
+def _json_keys(points: Dict) -> Dict:
+    """Point allocation with string keys; returned as-is when it already has them"""
+    if all(isinstance(k, str) for k in points):
+        return points
+    return {str(k): v for k, v in points.items()}
+
+
+# HTTP connection pool shared by every session: POOL_SIZE connections are kept alive,
+# up to POOL_OVERFLOW more are opened under load, and further requests wait for a free one
+# (10 connections in total by default, leaving headroom under small Supabase plans' client caps)
+POOL_SIZE = int(os.getenv("SUPABASE_POOL_SIZE", "5"))
+POOL_OVERFLOW = int(os.getenv("SUPABASE_POOL_OVERFLOW", "5"))
+# Idle connections are dropped before the Supabase edge closes them from its side
+POOL_KEEPALIVE_EXPIRY = 30
+REQUEST_TIMEOUT = 10
+CONNECT_TIMEOUT = 3
+# Connection attempts retried by the transport itself (nothing has been sent at that point)
+CONNECT_RETRIES = 1
+
+def _get_credential(key: str) -> Optional[str]:
+    """Read a credential from the environment or Streamlit secrets; not memoized, so a
+    missing value or a secrets.toml edit is picked up by the next DatabaseManager"""
+    value = os.getenv(key)
+    if value:
+        return value
+    try:
+        if hasattr(st, 'secrets') and key in st.secrets:
+            return st.secrets[key]
+    except Exception as e:
+        logger.warning(f"Could not access Streamlit secrets: {e}")
+    return None
+
+
+@st.cache_resource(show_spinner=False)
+def _get_client(url: str, key: str) -> "Client":
+    """One Supabase client per process, so its HTTP connection pool survives reruns"""
+    client = create_client(url, key)
+
+    # Swap PostgREST's default session for one with explicit pool limits, keeping its URL and headers.
+    # httpx already keeps connections alive and asks for gzip-compressed responses.
+    session = client.postgrest.session
+    client.postgrest.session = httpx.Client(
+        base_url=session.base_url,
+        headers=session.headers,
+        timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT),
+        transport=httpx.HTTPTransport(
+            limits=httpx.Limits(
+                max_connections=POOL_SIZE + POOL_OVERFLOW,
+                max_keepalive_connections=POOL_SIZE,
+                keepalive_expiry=POOL_KEEPALIVE_EXPIRY
+            ),
+            http2=HTTP2_AVAILABLE,
+            retries=CONNECT_RETRIES
+        ),
+        follow_redirects=True
+    )
+    session.close()
+    return client
+
+
+# Transient transport failures are retried with exponential backoff. Idempotent operations
+# retry on any of them; the rest only when the request never reached the server.
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 0.1
+_RETRYABLE_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError) if httpx else ()
+_UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout) if httpx else ()
+
+# Error codes meaning an optional function or view is not deployed; only these mark it missing
+_MISSING_FUNCTION_CODES = frozenset({"PGRST202", "42883"})
+_MISSING_RELATION_CODES = frozenset({"PGRST205", "42P01"})
+
+
+def _db_op(operation: str, default=None, idempotent: bool = True):
+    """Wrap a DatabaseManager method: retry transient errors, then report through
+    _handle_database_error and return a copy of default"""
+    retry_on = _RETRYABLE_ERRORS if idempotent else _UNSENT_ERRORS
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            for attempt in range(RETRY_ATTEMPTS):
+                try:
+                    return method(self, *args, **kwargs)
+                except retry_on as e:
+                    if attempt == RETRY_ATTEMPTS - 1:
+                        self._handle_database_error(operation, e)
+                        return copy(default)
+                    logger.warning(f"{operation} failed ({e}), retrying")
+                    time.sleep(RETRY_BACKOFF * 2 ** attempt)
+                except Exception as e:
+                    self._handle_database_error(operation, e)
+                    return copy(default)
+        return wrapper
+    return decorator
+
+
+# Startup recalculation runs on its own worker so the first page renders straight away
+_RECALC_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recalc")
+_RECALC_LOCK = threading.Lock()
+
+# Seconds a cached read is served before the next rerun goes back to Supabase.
+# Every write through DatabaseManager clears the caches it affects straight away.
+READ_CACHE_TTL = 30
+
+
+# Cached reads live at module level so every session shares them; the leading
+# underscore keeps the DatabaseManager out of Streamlit's cache key.
+@st.cache_data(ttl=READ_CACHE_TTL, show_spinner=False)
+def _cached_all_students(_db) -> List[Dict]:
+    result = _db.supabase.table("students").select("*").order("last_name").execute()
+    return result.data or []
+
+
+# One entry per Bib ID looked up, bounded so a long meet can't grow it without limit
+@st.cache_data(ttl=READ_CACHE_TTL, max_entries=1024, show_spinner=False)
+def _cached_student_by_bib(_db, bib_id: int) -> Optional[Dict]:
+    result = _db.supabase.table("students").select("*").eq("bib_id", bib_id).execute()
+    return result.data[0] if result.data else None
+
+
+@st.cache_data(ttl=READ_CACHE_TTL, show_spinner=False)
+def _cached_all_events(_db) -> List[Dict]:
+    result = _db.supabase.table("events").select("*").order("event_name").execute()
+    return result.data or []
+
+
+@st.cache_data(ttl=READ_CACHE_TTL, show_spinner=False)
+def _cached_event_by_name(_db, event_name: str) -> Optional[Dict]:
+    result = _db.supabase.table("events").select("*").eq("event_name", event_name).execute()
+    return result.data[0] if result.data else None
+
+
+@st.cache_data(ttl=READ_CACHE_TTL, show_spinner=False)
+def _cached_all_results(_db) -> List[Dict]:
+    return list(_db._iter_pages(
+        lambda: _db.supabase.table("results").select(PROJECTIONS["result_detail"]).order("result_id")
+    ))
+
+
+@st.cache_data(ttl=READ_CACHE_TTL, show_spinner=False)
+def _cached_recent_results(_db, limit: int) -> List[Dict]:
+    result = _db.supabase.table("results").select(
+        PROJECTIONS["result_recent"]
+    ).order("result_id", desc=True).limit(limit).execute()
+    return result.data or []
+
+
+@st.cache_data(ttl=READ_CACHE_TTL, show_spinner=False)
+def _cached_house_points(_db) -> List[Dict]:
+    return _db._load_house_points()
+
+
+@st.cache_data(ttl=READ_CACHE_TTL, show_spinner=False)
+def _cached_top_individual_athletes(_db, limit: int, gender: Optional[str]) -> List[Dict]:
+    return _db._load_top_individual_athletes(limit, gender)
+
+
+@st.cache_data(ttl=READ_CACHE_TTL, show_spinner=False)
+def _cached_best_athletes_by_gender(_db) -> Dict[str, Dict]:
+    return _db._load_best_athletes_by_gender()
+
+
+class ResultEntryError(Exception):
+    """add_result could not record a result; the message is written for the person entering it"""
+
+
 class DatabaseManager:
-    def __init__(self, recalc_on_startup: bool = True):
+    def __init__(self, recalc_on_startup: bool = False):
         if not SUPABASE_AVAILABLE:
             raise ImportError("Supabase client not available. Install with: pip install supabase")
 
-        url = self._get_credential("SUPABASE_URL")
-        key = self._get_credential("SUPABASE_KEY")
+        url = _get_credential("SUPABASE_URL")
+        key = _get_credential("SUPABASE_KEY")
         if not url or not key:
             raise ValueError("Supabase credentials not found. Please set SUPABASE_URL and SUPABASE_KEY")
 
         try:
-            self.supabase: Client = create_client(url, key)
+            self.supabase: Client = _get_client(url, key)
         except Exception as e:
             logger.error(f"Failed to create Supabase client: {e}")
             raise ConnectionError("Failed to create Supabase client") from e
 
-        if not self._test_connection():
-            raise ConnectionError("Failed to establish database connection")
+        # No round-trip here: connection problems surface through _handle_database_error on first use,
+        # and _test_connection stays available for explicit health checks
 
-        logger.info("Database connection established successfully")
+        # Optional views/RPCs found missing; once False, calls go straight to the fallback
+        self._caps: Dict[str, bool] = {}
 
         if recalc_on_startup:
-            try:
-                self.recalculate_all_points()
-                logger.info("Gender-specific recalculation completed on startup.")
-            except Exception as e:
-                logger.warning(f"Recalculation on startup failed: {e}")
-
-    def _get_credential(self, key: str) -> str:
-        value = os.getenv(key)
-        if value:
-            return value
+            self._start_background_recalc()
+
+    def _start_background_recalc(self):
+        """Run the startup recalculation off the render path; one at a time per process"""
+        if not _RECALC_LOCK.acquire(blocking=False):
+            logger.info("Startup recalculation already running; not starting another")
+            return
+        _RECALC_EXECUTOR.submit(self._recalc_on_startup).add_done_callback(lambda _: _RECALC_LOCK.release())
+
+    def _recalc_on_startup(self):
+        # Runs on a worker thread with no script context: failures go to the log, since st.error
+        # from here would reach no session (hence the undecorated _recalculate_all_points)
+        if not self._recalc_needed():
+            return
         try:
-            if hasattr(st, 'secrets') and key in st.secrets:
-                return st.secrets[key]
+            self._recalculate_all_points()
+            logger.info("Gender-specific recalculation completed on startup.")
         except Exception as e:
-            logger.warning(f"Could not access Streamlit secrets: {e}")
-        return None
+            logger.error(f"Recalculation on startup failed: {e}")
+
+    def _recalc_needed(self) -> bool:
+        """Whether standings may be stale since the last full recalculation; assume so if the flag can't be read"""
+        try:
+            result = self.supabase.table("meta").select("recalc_needed").eq("id", 1).execute()
+            return not result.data or bool(result.data[0]["recalc_needed"])
+        except Exception as e:
+            logger.warning(f"Could not read recalculation flag: {e}")
+            return True
+
+    def _mark_missing(self, cap: str, error: Exception, missing_codes: frozenset) -> None:
+        """Record that an optional view/RPC is not deployed; any other error is re-raised to the caller,
+        and the fast path is tried again on the next call"""
+        if getattr(error, "code", None) not in missing_codes:
+            raise error
+        self._caps[cap] = False
 
     def _test_connection(self) -> bool:
         try:
-            self.supabase.table("students").select("count", count="exact").limit(1).execute()
+            # HEAD request with the planner's estimate: no body and no COUNT(*) scan
+            result = self.supabase.table("students").select("bib_id", count="planned", head=True).limit(1).execute()
+            if result.count is None:
+                logger.error("Database connection test failed: no row count returned")
+                return False
             logger.info("Database connection test successful")
             return True
         except Exception as e:
@@ -75,615 +318,582 @@ class DatabaseManager:
     def _handle_database_error(self, operation: str, error: Exception):
         error_msg = f"Database error in {operation}: {str(error)}"
         logger.error(error_msg)
-        if "duplicate key" in str(error).lower():
-            st.error("A record with this ID already exists.")
-        elif "foreign key" in str(error).lower():
+        # PostgREST passes the Postgres SQLSTATE through on APIError.code
+        code = getattr(error, "code", None)
+        if code == "23505" or "duplicate key" in str(error).lower():
+            if "results_bib_event_unique" in str(error):
+                st.error("A result for this student in this event already exists.")
+            else:
+                st.error("A record with this ID already exists.")
+        elif code == "23503" or "foreign key" in str(error).lower():
             st.error("Referenced record does not exist.")
-        elif "not-null constraint" in str(error).lower():
+        elif code == "23502" or "not-null constraint" in str(error).lower():
             st.error("Required field is missing.")
         else:
             st.error(f"Database operation failed: {operation}")
 
+    def invalidate_cache(self):
+        """Drop every cached read so the next call goes back to the database"""
+        _cached_all_students.clear()
+        _cached_student_by_bib.clear()
+        _cached_all_events.clear()
+        _cached_event_by_name.clear()
+        self._invalidate_scoring_caches()
+
+    @staticmethod
+    def _invalidate_scoring_caches():
+        # Anything that changes results, relay teams or points feeds these reads
+        _cached_all_results.clear()
+        _cached_recent_results.clear()
+        _cached_house_points.clear()
+        _cached_top_individual_athletes.clear()
+        _cached_best_athletes_by_gender.clear()
+
+    def _iter_pages(self, build_query: Callable, page_size: int = PAGE_SIZE) -> Iterator[Dict]:
+        """Yield rows from a query one page at a time; build_query must return a fresh, ordered query"""
+        offset = 0
+        while True:
+            rows = build_query().range(offset, offset + page_size - 1).execute().data or []
+            yield from rows
+            if len(rows) < page_size:
+                return
+            offset += page_size
+
+    @staticmethod
+    def _sort_by_result(rows: List[Dict], lower_is_better: bool = True) -> List[Dict]:
+        """Sort rows by result_value, keeping the original order on ties"""
+        sign = 1.0 if lower_is_better else -1.0
+        keyed = [(sign * float(row["result_value"]), idx, row) for idx, row in enumerate(rows)]
+        keyed.sort()
+        return [row for _, _, row in keyed]
+
     # ------------------- Relay Team Operations (Updated to use bib_id) -------------------
+    @staticmethod
+    def _relay_team_row(team_name: str, house: str, event_id: int,
+                        member1_bib: int, member2_bib: int, member3_bib: int, member4_bib: int) -> Dict:
+        return {
+            "team_name": team_name,
+            "house": house,
+            "event_id": event_id,
+            "member1_bib_id": member1_bib,
+            "member2_bib_id": member2_bib,
+            "member3_bib_id": member3_bib,
+            "member4_bib_id": member4_bib
+        }
+
+    @_db_op("add_relay_team", False, idempotent=False)
     def add_relay_team(self, team_name: str, house: str, event_id: int, 
                        member1_bib: int, member2_bib: int, member3_bib: int, member4_bib: int) -> bool:
-        try:
-            result = self.supabase.table("relay_teams").insert({
-                "team_name": team_name,
-                "house": house,
-                "event_id": event_id,
-                "member1_bib_id": member1_bib,
-                "member2_bib_id": member2_bib,
-                "member3_bib_id": member3_bib,
-                "member4_bib_id": member4_bib
-            }).execute()
-            if result.data:
-                logger.info(f"Relay team added successfully: {team_name}")
-                return True
+        result = self.supabase.table("relay_teams").insert(self._relay_team_row(
+            team_name, house, event_id, member1_bib, member2_bib, member3_bib, member4_bib
+        )).execute()
+        if result.data:
+            self._invalidate_scoring_caches()
+            logger.info(f"Relay team added successfully: {team_name}")
+            return True
+        return False
+
+    @_db_op("add_relay_teams_bulk", False, idempotent=False)
+    def add_relay_teams_bulk(self, teams: List[Dict]) -> bool:
+        """Register several relay teams in one insert; each dict takes add_relay_team's arguments
+        plus an optional result_value"""
+        if not teams:
             return False
-        except Exception as e:
-            self._handle_database_error("add_relay_team", e)
+        rows = []
+        for team in teams:
+            row = self._relay_team_row(
+                team["team_name"], team["house"], team["event_id"],
+                team["member1_bib"], team["member2_bib"], team["member3_bib"], team["member4_bib"]
+            )
+            if team.get("result_value") is not None:
+                row["result_value"] = float(team["result_value"])
+            rows.append(row)
+        
+        result = self.supabase.table("relay_teams").insert(rows).execute()
+        if not result.data:
             return False
+        
+        # Standings only change for events where a team arrived with a time
+        for event_id in {row["event_id"] for row in rows if "result_value" in row}:
+            self._calculate_relay_positions_and_points(event_id)
+        self._invalidate_scoring_caches()
+        
+        logger.info(f"{len(rows)} relay teams added successfully")
+        return True
 
+    @_db_op("add_relay_team_result", False)
     def add_relay_team_result(self, team_id: int, result_value: float) -> bool:
-        try:
-            result = self.supabase.table("relay_teams").update({
-                "result_value": float(result_value)
-            }).eq("team_id", team_id).execute()
-            
-            if result.data:
-                # Get event info and calculate relay positions
-                team_data = self.supabase.table("relay_teams").select("event_id").eq("team_id", team_id).execute()
-                if team_data.data:
-                    event_id = team_data.data[0]["event_id"]
-                    self._calculate_relay_positions_and_points(event_id)
-                logger.info(f"Relay team result added successfully for team {team_id}")
-                return True
-            return False
-        except Exception as e:
-            self._handle_database_error("add_relay_team_result", e)
-            return False
+        result = self.supabase.table("relay_teams").update({
+            "result_value": float(result_value)
+        }).eq("team_id", team_id).execute()
+        
+        if result.data:
+            # The update returns the team row, event_id included
+            self._calculate_relay_positions_and_points(result.data[0]["event_id"])
+            self._invalidate_scoring_caches()
+            logger.info(f"Relay team result added successfully for team {team_id}")
+            return True
+        return False
 
+    @_db_op("calculate_relay_positions_and_points")
     def _calculate_relay_positions_and_points(self, event_id: int):
         """Calculate relay team positions and points (relay teams compete together regardless of gender)"""
-        try:
-            # Get event details
-            event_result = self.supabase.table("events").select("*").eq("event_id", event_id).execute()
-            if not event_result.data:
-                return
-                
-            event_data = event_result.data[0]
-            # For relay events, use either relay-specific points or default relay points
-            point_allocation = event_data.get("relay_male_points", {"1": 15, "2": 9, "3": 5, "4": 3})
-            
-            # Get all teams with results for this event
-            teams_result = self.supabase.table("relay_teams").select("*").eq("event_id", event_id).execute()
-            if not teams_result.data:
-                return
-            
-            # Filter teams with results and sort by time (lower is better for track events)
-            teams_with_results = [team for team in teams_result.data if team.get("result_value")]
-            sorted_teams = sorted(teams_with_results, key=lambda x: float(x["result_value"]))
-            
-            # Assign positions and points
-            for i, team in enumerate(sorted_teams):
-                position = i + 1
-                points = point_allocation.get(str(position), 0)
-                
-                self.supabase.table("relay_teams").update({
-                    "position": position,
-                    "points": points
-                }).eq("team_id", team["team_id"]).execute()
-            
-            logger.info(f"Relay team positions calculated for event {event_id}: {len(sorted_teams)} teams")
+        # The event's scoring and its teams are independent reads, so fetch them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            event_future = executor.submit(
+                lambda: self.supabase.table("events").select(PROJECTIONS["relay_scoring"]).eq("event_id", event_id).execute()
+            )
+            teams_future = executor.submit(
+                lambda: self.supabase.table("relay_teams").select(PROJECTIONS["relay_ranking"]).eq("event_id", event_id).execute()
+            )
+            event_result = event_future.result()
+            teams_result = teams_future.result()
+        
+        if not event_result.data or not teams_result.data:
+            return
             
-        except Exception as e:
-            self._handle_database_error("calculate_relay_positions_and_points", e)
+        event_data = event_result.data[0]
+        # For relay events, use either relay-specific points or default relay points
+        point_allocation = event_data.get("relay_male_points", _RELAY_POINTS_JSON)
+        
+        # Filter teams with results and sort by time (lower is better for track events)
+        teams_with_results = [team for team in teams_result.data if team.get("result_value")]
+        sorted_teams = self._sort_by_result(teams_with_results)
+        
+        # Assign positions and points, keeping only the teams whose standing changes
+        payload = []
+        for i, team in enumerate(sorted_teams):
+            position = i + 1
+            points = point_allocation.get(str(position), 0)
+            if team["position"] != position or team["points"] != points:
+                payload.append({**team, "position": position, "points": points})
+        
+        # One request writes every changed team; the full row satisfies NOT NULL checks on upsert
+        if payload:
+            self.supabase.table("relay_teams").upsert(payload, on_conflict="team_id").execute()
+        
+        logger.info(f"Relay team positions calculated for event {event_id}: {len(sorted_teams)} teams")
+        
 
     def get_relay_teams_by_event(self, event_id: int) -> List[Dict]:
-        try:
-            # Try to use the view first
-            result = self.supabase.table("relay_team_results").select("*").eq("event_id", event_id).order("position", desc=False).execute()
-            if result.data:
-                return result.data
-        except:
-            pass
+        return self.get_relay_teams_by_events([event_id])
+
+    @_db_op("get_relay_teams_by_events", [])
+    def get_relay_teams_by_events(self, event_ids: List[int]) -> List[Dict]:
+        """Get relay teams for several events in one query, ordered by event then position"""
+        if not event_ids:
+            return []
+        # The view is probed by its first use; once found missing, calls go straight to the table.
+        # An empty answer from the view is final, not a reason to ask the table as well
+        if self._caps.get("relay_view", True):
+            try:
+                result = self.supabase.table("relay_team_results").select("*").in_("event_id", event_ids).order("event_id").order("position", desc=False).execute()
+                return result.data or []
+            except APIError as e:
+                self._mark_missing("relay_view", e, _MISSING_RELATION_CODES)
+                logger.warning(f"Relay team results view not available, using relay_teams table: {e}")
         
         # Fallback to direct table query
-        try:
-            result = self.supabase.table("relay_teams").select("*").eq("event_id", event_id).order("position", desc=False).execute()
-            return result.data or []
-        except Exception as e:
-            self._handle_database_error("get_relay_teams_by_event", e)
-            return []
+        result = self.supabase.table("relay_teams").select("*").in_("event_id", event_ids).order("event_id").order("position", desc=False).execute()
+        return result.data or []
 
     # ------------------- Top Athletes (Updated for gender-specific rankings) -------------------
+    @_db_op("get_top_individual_athletes", [])
     def get_top_individual_athletes(self, limit: int = 20, gender: str = None) -> List[Dict]:
         """Get top individual athletes, optionally filtered by gender"""
-        try:
-            # Build query with optional gender filter
-            query = self.supabase.table("athlete_complete_performance").select("*")
-            
-            if gender:
-                query = query.eq("gender", gender)
-                query = query.order("gender_rank", desc=False)
-            else:
-                query = query.order("overall_rank", desc=False)
-            
-            query = query.limit(limit)
-            result = query.execute()
-            
-            return result.data or []
-            
-        except Exception as e:
-            # Fallback to manual calculation
-            logger.warning(f"View not available, using manual calculation: {e}")
-            return self._calculate_top_athletes_manually(limit, gender)
+        return _cached_top_individual_athletes(self, limit, gender)
 
-    def _calculate_top_athletes_manually(self, limit: int, gender: str = None) -> List[Dict]:
-        """Manual calculation of top athletes when view is not available"""
-        try:
-            # Get all individual results (non-relay) with student info
-            query = self.supabase.table("results").select("""
-                *,
-                students!inner(bib_id, curtin_id, first_name, last_name, house, gender),
-                events!inner(event_name, event_type, is_relay)
-            """)
-            
-            if gender:
-                query = query.eq("students.gender", gender)
-                
-            results = query.execute()
-            
-            if not results.data:
-                return []
-            
-            # Aggregate by student
-            student_stats = {}
-            for result in results.data:
-                # Skip relay events
-                if result["events"]["is_relay"]:
-                    continue
-                    
-                bib_id = result["students"]["bib_id"]
-                points = result.get("points", 0)
-                position = result.get("position", 999)
-                
-                if bib_id not in student_stats:
-                    student_stats[bib_id] = {
-                        "bib_id": bib_id,
-                        "curtin_id": result["students"]["curtin_id"],
-                        "first_name": result["students"]["first_name"],
-                        "last_name": result["students"]["last_name"],
-                        "house": result["students"]["house"],
-                        "gender": result["students"]["gender"],
-                        "total_events": 0,
-                        "total_points": 0,
-                        "gold_medals": 0,
-                        "silver_medals": 0,
-                        "bronze_medals": 0
-                    }
-                
-                student_stats[bib_id]["total_events"] += 1
-                student_stats[bib_id]["total_points"] += points
-                
-                if position == 1:
-                    student_stats[bib_id]["gold_medals"] += 1
-                elif position == 2:
-                    student_stats[bib_id]["silver_medals"] += 1
-                elif position == 3:
-                    student_stats[bib_id]["bronze_medals"] += 1
-            
-            # Convert to list and sort
-            athletes = list(student_stats.values())
-            athletes.sort(key=lambda x: (x["total_points"], x["gold_medals"]), reverse=True)
-            
-            # Add rankings
-            for i, athlete in enumerate(athletes):
-                athlete["overall_rank"] = i + 1
-                athlete["gender_rank"] = i + 1  # Simplified for manual calc
-            
-            return athletes[:limit]
-            
-        except Exception as e:
-            self._handle_database_error("calculate_top_athletes_manually", e)
-            return []
+    def _load_top_individual_athletes(self, limit: int, gender: str = None) -> List[Dict]:
+        # Points and medals are aggregated by the athlete_complete_performance view
+        query = self.supabase.table("athlete_complete_performance").select(PROJECTIONS["athlete_performance"])
+        
+        if gender:
+            query = query.eq("gender", gender)
+            query = query.order("gender_rank", desc=False)
+        else:
+            query = query.order("overall_rank", desc=False)
+        
+        result = query.limit(limit).execute()
+        return result.data or []
 
+    @_db_op("get_best_athletes_by_gender", {})
     def get_best_athletes_by_gender(self) -> Dict[str, Dict]:
         """Get the best male and female athlete"""
-        try:
-            male_athletes = self.get_top_individual_athletes(limit=1, gender="Male")
-            female_athletes = self.get_top_individual_athletes(limit=1, gender="Female")
-            
-            result = {}
-            if male_athletes:
-                result["Male"] = male_athletes[0]
-            if female_athletes:
-                result["Female"] = female_athletes[0]
-                
-            return result
-            
-        except Exception as e:
-            self._handle_database_error("get_best_athletes_by_gender", e)
-            return {}
+        return _cached_best_athletes_by_gender(self)
+
+    def _load_best_athletes_by_gender(self) -> Dict[str, Dict]:
+        # One row per gender via DISTINCT ON in the database
+        if self._caps.get("best_athletes_rpc", True):
+            try:
+                result = self.supabase.rpc("best_athletes_by_gender").execute()
+                return {athlete["gender"]: athlete for athlete in result.data or []}
+            except APIError as e:
+                self._mark_missing("best_athletes_rpc", e, _MISSING_FUNCTION_CODES)
+                logger.warning(f"best_athletes_by_gender not available, querying the view: {e}")
+        
+        # Both leaders in one request; rank ties keep the first row per gender
+        leaders = self.supabase.table("athlete_complete_performance").select(PROJECTIONS["athlete_performance"]).in_(
+            "gender", ["Male", "Female"]
+        ).eq("gender_rank", 1).execute()
+        result = {}
+        for athlete in leaders.data or []:
+            result.setdefault(athlete["gender"], athlete)
+        return result
 
     # ------------------- House Points (Updated) -------------------
     def get_house_points(self) -> List[Dict]:
         try:
-            # Try to use the corrected view
-            result = self.supabase.table("corrected_house_points").select("*").execute()
-            if result.data:
-                house_list = []
-                for row in result.data:
-                    individual_points = row.get("individual_points", 0) or 0
-                    relay_points = row.get("relay_team_points", 0) or 0
-                    total_points = row.get("total_points") or (individual_points + relay_points)
-                    
-                    house_list.append({
-                        "house": row["house"],
-                        "total_points": total_points,
-                        "individual_points": individual_points,
-                        "relay_team_points": relay_points
-                    })
-                
-                house_list.sort(key=lambda x: x["total_points"], reverse=True)
-                return house_list
-                
+            return _cached_house_points(self)
         except Exception as e:
-            logger.warning(f"Corrected house points view not available: {e}")
+            logger.error(f"Error calculating house points: {e}")
+            return []
 
-        # Fallback calculation
-        return self._calculate_house_points_manually()
+    def _load_house_points(self) -> List[Dict]:
+        # corrected_house_points sums and coalesces per house; Postgres also does the ranking
+        result = self.supabase.table("corrected_house_points").select(
+            PROJECTIONS["house_points"]
+        ).order("total_points", desc=True).execute()
+        return result.data or []
 
-    def _calculate_house_points_manually(self) -> List[Dict]:
-        """Manual house points calculation"""
-        try:
-            house_totals = {}
-            
-            # Get individual event points
-            results = self.supabase.table("results").select("""
-                *, 
-                students!inner(house),
-                events!inner(is_relay)
-            """).execute()
-            
-            if results.data:
-                for result in results.data:
-                    house = result["students"]["house"]
-                    points = result.get("points", 0) or 0
-                    is_relay = result["events"]["is_relay"]
-                    
-                    if house not in house_totals:
-                        house_totals[house] = {"individual_points": 0, "relay_team_points": 0}
-                    
-                    # Only count individual events here
-                    if not is_relay:
-                        house_totals[house]["individual_points"] += points
-            
-            # Get relay team points
-            relay_results = self.supabase.table("relay_teams").select("house, points").execute()
-            if relay_results.data:
-                for team in relay_results.data:
-                    house = team.get("house")
-                    points = team.get("points", 0) or 0
-                    
-                    if house not in house_totals:
-                        house_totals[house] = {"individual_points": 0, "relay_team_points": 0}
-                    
-                    house_totals[house]["relay_team_points"] += points
-            
-            # Convert to list format
-            house_list = []
-            for house, points_data in house_totals.items():
-                individual_points = points_data["individual_points"]
-                relay_points = points_data["relay_team_points"]
-                total_points = individual_points + relay_points
-                
-                house_list.append({
-                    "house": house,
-                    "total_points": total_points,
-                    "individual_points": individual_points,
-                    "relay_team_points": relay_points
-                })
-            
-            house_list.sort(key=lambda x: x["total_points"], reverse=True)
-            return house_list
-            
-        except Exception as e:
-            logger.error(f"Error in manual house points calculation: {e}")
-            return []
 
     # ------------------- Recalculation (Updated for gender-specific) -------------------
+    @_db_op("recalculate_all_points", False)
     def recalculate_all_points(self) -> bool:
-        """Recalculate all points using gender-specific allocations"""
-        try:
-            # Try to use the SQL function first
-            result = self.supabase.rpc("recalculate_points_by_gender").execute()
-            if result.data:
-                logger.info("All points recalculated with gender-specific allocations using SQL function")
-                return True
-        except Exception as e:
-            logger.warning(f"SQL function not available, using manual recalculation: {e}")
-        
-        # Fallback: manual recalculation
-        try:
-            events = self.get_all_events()
-            for event in events:
-                if event.get("is_relay"):
-                    self._calculate_relay_positions_and_points(event["event_id"])
-                else:
-                    self._calculate_gender_specific_positions(event["event_id"])
-            
-            logger.info("All points recalculated manually with gender-specific allocations")
-            return True
-            
-        except Exception as e:
-            self._handle_database_error("recalculate_all_points", e)
-            return False 
+        """Recalculate all individual and relay points using gender-specific allocations"""
+        return self._recalculate_all_points()
+
+    def _recalculate_all_points(self) -> bool:
+        # The SQL function re-ranks every event in one call; it is part of the required schema
+        result = self.supabase.rpc("recalculate_points_by_gender").execute()
+        self._invalidate_scoring_caches()
+        logger.info(f"All points recalculated using SQL function: {result.data}")
+        return True
+
+    @_db_op("add_student", False, idempotent=False)
     def add_student(self, curtin_id: str, bib_id: int, first_name: str, 
                     last_name: str, house: str, gender: str) -> bool:
-        try:
-            result = self.supabase.table("students").insert({
-                "bib_id": bib_id,  # Now primary key
-                "curtin_id": curtin_id,
-                "first_name": first_name,
-                "last_name": last_name,
-                "house": house,
-                "gender": gender
-            }).execute()
-            if result.data:
-                logger.info(f"Student added successfully: {first_name} {last_name} ({gender}) - Bib #{bib_id}")
-                return True
-            return False
-        except Exception as e:
-            self._handle_database_error("add_student", e)
-            return False
+        result = self.supabase.table("students").insert({
+            "bib_id": bib_id,  # Now primary key
+            "curtin_id": curtin_id,
+            "first_name": first_name,
+            "last_name": last_name,
+            "house": house,
+            "gender": gender
+        }).execute()
+        if result.data:
+            _cached_all_students.clear()
+            _cached_student_by_bib.clear()
+            logger.info(f"Student added successfully: {first_name} {last_name} ({gender}) - Bib #{bib_id}")
+            return True
+        return False
 
+    @_db_op("get_student_by_bib")
     def get_student_by_bib(self, bib_id: int) -> Optional[Dict]:
-        try:
-            result = self.supabase.table("students").select("*").eq("bib_id", bib_id).execute()
-            if result.data:
-                return result.data[0]
-            return None
-        except Exception as e:
-            self._handle_database_error("get_student_by_bib", e)
-            return None
+        return _cached_student_by_bib(self, int(bib_id))
 
+    @_db_op("get_student_by_curtin_id")
     def get_student_by_curtin_id(self, curtin_id: str) -> Optional[Dict]:
-        try:
-            result = self.supabase.table("students").select("*").eq("curtin_id", curtin_id).execute()
-            if result.data:
-                return result.data[0]
-            return None
-        except Exception as e:
-            self._handle_database_error("get_student_by_curtin_id", e)
-            return None
+        result = self.supabase.table("students").select("*").eq("curtin_id", curtin_id).execute()
+        if result.data:
+            return result.data[0]
+        return None
 
+    @_db_op("get_all_students", [])
     def get_all_students(self) -> List[Dict]:
-        try:
-            result = self.supabase.table("students").select("*").order("last_name").execute()
-            return result.data or []
-        except Exception as e:
-            self._handle_database_error("get_all_students", e)
-            return []
+        return _cached_all_students(self)
 
     # ------------------- Event Operations (Updated with gender-specific points) -------------------
+    @_db_op("add_event", False, idempotent=False)
     def add_event(self, event_name: str, event_type: str, unit: str, 
                   is_relay: bool = False, male_points: Dict = None, female_points: Dict = None) -> bool:
-        try:
-            if not male_points:
-                male_points = {"1": 15, "2": 9, "3": 5, "4": 3} if is_relay else {"1": 10, "2": 6, "3": 3, "4": 1}
-            if not female_points:
-                female_points = {"1": 15, "2": 9, "3": 5, "4": 3} if is_relay else {"1": 10, "2": 6, "3": 3, "4": 1}
-            
-            # Ensure string keys for JSONB
-            male_points = {str(k): v for k, v in male_points.items()}
-            female_points = {str(k): v for k, v in female_points.items()}
-            
-            result = self.supabase.table("events").insert({
-                "event_name": event_name,
-                "event_type": event_type,
-                "unit": unit,
-                "is_relay": is_relay,
-                "male_point_allocation": male_points,
-                "female_point_allocation": female_points,
-                # Keep legacy fields for compatibility
-                "point_allocation": male_points,  # Default to male for legacy
-                "point_system_name": "Relay Events" if is_relay else "Individual Events"
-            }).execute()
-            if result.data:
-                logger.info(f"Event added successfully: {event_name} (Gender-specific points)")
-                return True
-            return False
-        except Exception as e:
-            self._handle_database_error("add_event", e)
-            return False
+        # JSONB wants string keys; the defaults already are, and so are dicts read back from the database
+        if male_points:
+            male_points = _json_keys(male_points)
+        else:
+            male_points = _RELAY_POINTS_JSON if is_relay else _MALE_POINTS_JSON
+        if female_points:
+            female_points = _json_keys(female_points)
+        else:
+            female_points = _RELAY_POINTS_JSON if is_relay else _FEMALE_POINTS_JSON
+        
+        result = self.supabase.table("events").insert({
+            "event_name": event_name,
+            "event_type": event_type,
+            "unit": unit,
+            "is_relay": is_relay,
+            "male_point_allocation": male_points,
+            "female_point_allocation": female_points,
+            # Keep legacy fields for compatibility
+            "point_allocation": male_points,  # Default to male for legacy
+            "point_system_name": "Relay Events" if is_relay else "Individual Events"
+        }).execute()
+        if result.data:
+            _cached_all_events.clear()
+            _cached_event_by_name.clear()
+            logger.info(f"Event added successfully: {event_name} (Gender-specific points)")
+            return True
+        return False
 
+    @_db_op("get_event_by_name")
     def get_event_by_name(self, event_name: str) -> Optional[Dict]:
-        try:
-            result = self.supabase.table("events").select("*").eq("event_name", event_name).execute()
-            if result.data:
-                return result.data[0]
-            return None
-        except Exception as e:
-            self._handle_database_error("get_event_by_name", e)
-            return None
+        return _cached_event_by_name(self, event_name)
 
+    @_db_op("get_all_events", [])
     def get_all_events(self) -> List[Dict]:
-        try:
-            result = self.supabase.table("events").select("*").order("event_name").execute()
-            return result.data or []
-        except Exception as e:
-            self._handle_database_error("get_all_events", e)
-            return []
+        return _cached_all_events(self)
 
     def add_result(self, bib_id: int, event_id: int, result_value: float) -> bool:
-        """Add result using bib_id or curtin_id fallback"""
+        """Add a result for a student; duplicates are rejected by the database.
+        Returns True, or raises ResultEntryError with the reason: nothing is rendered here,
+        since the caller may be a widget callback where st.error would land outside the form"""
+        # Validate inputs first
+        if not bib_id or not event_id or result_value is None:
+            raise ResultEntryError("Missing required data for result entry")
         try:
-            # Validate inputs first
-            if not bib_id or not event_id or result_value is None:
-                st.error("Missing required data for result entry")
-                return False
-                
-            # Validate student exists
-            student = self.get_student_by_bib(bib_id)
+            # Validate student exists; read through the cache directly so a failure surfaces here
+            student = _cached_student_by_bib(self, int(bib_id))
             if not student:
-                st.error(f"No student found with Bib ID {bib_id}")
-                return False
+                raise ResultEntryError(f"No student found with Bib ID {bib_id}")
+            
+            # ON CONFLICT DO NOTHING against UNIQUE (bib_id, event_id): a second result comes back
+            # as an empty row set in the same round trip instead of as an error to unwind
+            result = self.supabase.table("results").upsert({
+                "bib_id": int(bib_id),
+                "event_id": int(event_id),
+                "result_value": float(result_value),
+                "points": 0,
+                "position": 999,
+                "house": student["house"]  # Add house from student data
+            }, on_conflict="bib_id,event_id", ignore_duplicates=True).execute()
             
-            # Try bib_id first, fallback to curtin_id if column doesn't exist
-            try:
-                # Check if result already exists using bib_id
-                existing = self.supabase.table("results").select("*").eq("bib_id", bib_id).eq("event_id", event_id).execute()
-                use_bib_id = True
-            except Exception as e:
-                if "column" in str(e).lower() and "bib_id" in str(e).lower():
-                    # bib_id column doesn't exist yet, use curtin_id
-                    existing = self.supabase.table("results").select("*").eq("curtin_id", student["curtin_id"]).eq("event_id", event_id).execute()
-                    use_bib_id = False
-                else:
-                    raise e
-            
-            if existing.data:
-                st.error("A result for this student in this event already exists.")
-                return False
-            
-            # Prepare insert data based on which column exists
-            if use_bib_id:
-                insert_data = {
-                    "bib_id": int(bib_id),
-                    "event_id": int(event_id),
-                    "result_value": float(result_value),
-                    "points": 0,
-                    "position": 999,
-                    "house": student["house"]  # Add house from student data
-                }
-            else:
-                insert_data = {
-                    "curtin_id": student["curtin_id"],
-                    "event_id": int(event_id),
-                    "result_value": float(result_value),
-                    "points": 0,
-                    "position": 999,
-                    "house": student["house"]  # Add house from student data
-                }
-            
-            result = self.supabase.table("results").insert(insert_data).execute()
+            if not result.data:
+                raise ResultEntryError("A result for this student in this event already exists.")
             
-            if result.data:
-                # Recalculate positions and points for this event
-                if use_bib_id:
-                    self._calculate_gender_specific_positions(event_id)
-                else:
-                    # Fallback to old calculation if using curtin_id
-                    self._calculate_positions_and_points(event_id)
-                logger.info(f"Result added successfully for bib #{bib_id} in event {event_id}")
-                return True
-            else:
-                st.error("Failed to insert result - no data returned")
-                return False
+            # Recalculate positions and points for this event
+            self._calculate_gender_specific_positions(event_id)
+            self._invalidate_scoring_caches()
+            logger.info(f"Result added successfully for bib #{bib_id} in event {event_id}")
+            return True
+        except ResultEntryError:
+            raise
         except Exception as e:
             error_msg = str(e).lower()
-            if "not-null constraint" in error_msg or "null value" in error_msg:
-                st.error("Missing required field. Please contact administrator.")
+            if getattr(e, "code", None) == "23505":
+                reason = "A result for this student in this event already exists."
+            elif "not-null constraint" in error_msg or "null value" in error_msg:
+                reason = "Missing required field. Please contact administrator."
             elif "foreign key" in error_msg:
-                st.error("Invalid student or event reference.")
+                reason = "Invalid student or event reference."
             elif "duplicate key" in error_msg or "unique" in error_msg:
-                st.error("This student already has a result for this event.")
+                reason = "This student already has a result for this event."
             elif "column" in error_msg and "does not exist" in error_msg:
-                st.error("Database schema issue. Please contact administrator.")
+                reason = "Database schema issue. Please contact administrator."
             else:
-                st.error(f"Database error: {str(e)}")
+                reason = f"Database error: {str(e)}"
             
             logger.error(f"Error in add_result: {str(e)}")
-            return False
+            raise ResultEntryError(reason) from e
 
-    def _calculate_gender_specific_positions(self, event_id: int):
-        """Calculate positions and points separately for male and female competitors"""
+    def add_results_bulk(self, event_id: int, entries: List[Tuple[int, float]]) -> Dict:
+        """Add several (bib_id, result_value) results for one event with a single insert and one recalculation"""
+        summary = {"added": 0, "unknown_bibs": [], "existing_bibs": []}
+        if not entries:
+            return summary
         try:
-            # Get event details
-            event_result = self.supabase.table("events").select("*").eq("event_id", event_id).execute()
-            if not event_result.data:
-                logger.warning(f"Event {event_id} not found")
-                return
-                
-            event_data = event_result.data[0]
-            event_type = event_data["event_type"]
-            male_points = event_data.get("male_point_allocation", {"1": 10, "2": 6, "3": 3, "4": 1})
-            female_points = event_data.get("female_point_allocation", {"1": 10, "2": 6, "3": 3, "4": 1})
-            
-            # Get all results for this event with student gender
-            results_query = self.supabase.table("results").select("""
-                *, students!inner(gender)
-            """).eq("event_id", event_id).execute()
+            bib_ids = list({int(bib_id) for bib_id, _ in entries})
+            
+            # One lookup for every student's house
+            students = self.supabase.table("students").select("bib_id, house").in_("bib_id", bib_ids).execute()
+            houses = {student["bib_id"]: student["house"] for student in students.data or []}
+            
+            insert_data = []
+            batch_bibs = set()
+            for bib_id, result_value in entries:
+                bib_id = int(bib_id)
+                if bib_id not in houses:
+                    summary["unknown_bibs"].append(bib_id)
+                elif bib_id in batch_bibs:
+                    summary["existing_bibs"].append(bib_id)
+                else:
+                    batch_bibs.add(bib_id)
+                    insert_data.append({
+                        "bib_id": bib_id,
+                        "event_id": int(event_id),
+                        "result_value": float(result_value),
+                        "points": 0,
+                        "position": 999,
+                        "house": houses[bib_id]
+                    })
             
-            if not results_query.data:
+            if insert_data:
+                # ON CONFLICT DO NOTHING, as in add_result: a student who already has a result here,
+                # even one recorded by another scorer a moment ago, is skipped instead of failing the batch
+                result = self.supabase.table("results").upsert(
+                    insert_data, on_conflict="bib_id,event_id", ignore_duplicates=True
+                ).execute()
+                inserted_bibs = {row["bib_id"] for row in result.data or []}
+                summary["added"] = len(inserted_bibs)
+                summary["existing_bibs"].extend(row["bib_id"] for row in insert_data if row["bib_id"] not in inserted_bibs)
+                if inserted_bibs:
+                    self._calculate_gender_specific_positions(event_id)
+                    self._invalidate_scoring_caches()
+                logger.info(f"{summary['added']} results added for event {event_id}")
+            return summary
+        except Exception as e:
+            self._handle_database_error("add_results_bulk", e)
+            return summary
+
+    @_db_op("calculate_gender_specific_positions")
+    def _calculate_gender_specific_positions(self, event_id: int):
+        """Calculate positions and points separately for male and female competitors"""
+        # Let the database rank the event and write positions/points in a single call
+        if self._caps.get("event_recalc_rpc", True):
+            try:
+                self.supabase.rpc("recalculate_event_positions", {"event_id_param": event_id}).execute()
+                logger.info(f"Gender-specific positions calculated for event {event_id} using SQL function")
                 return
-            
-            # Separate by gender
-            male_results = [r for r in results_query.data if r["students"]["gender"] == "Male"]
-            female_results = [r for r in results_query.data if r["students"]["gender"] == "Female"]
-            
-            # Sort and assign positions/points for males
-            if event_type == "Track":
-                male_results.sort(key=lambda x: float(x["result_value"]))  # Lower is better
-            else:
-                male_results.sort(key=lambda x: float(x["result_value"]), reverse=True)  # Higher is better
-                
-            for i, result in enumerate(male_results):
-                position = i + 1
-                points = male_points.get(str(position), 0)
-                self.supabase.table("results").update({
-                    "position": position,
-                    "points": points
-                }).eq("result_id", result["result_id"]).execute()
-            
-            # Sort and assign positions/points for females
-            if event_type == "Track":
-                female_results.sort(key=lambda x: float(x["result_value"]))  # Lower is better
-            else:
-                female_results.sort(key=lambda x: float(x["result_value"]), reverse=True)  # Higher is better
-                
-            for i, result in enumerate(female_results):
+            except APIError as e:
+                self._mark_missing("event_recalc_rpc", e, _MISSING_FUNCTION_CODES)
+                logger.warning(f"SQL function not available, using manual position calculation: {e}")
+        
+        # The event type sets the sort direction; it comes from the cached events list, not a query
+        event_data = next((event for event in self.get_all_events() if event["event_id"] == event_id), None)
+        if not event_data:
+            logger.warning(f"Event {event_id} not found")
+            return
+            
+        event_type = event_data["event_type"]
+        male_points = event_data.get("male_point_allocation") or _MALE_POINTS_JSON
+        female_points = event_data.get("female_point_allocation") or _FEMALE_POINTS_JSON
+        
+        # Track: lower is better, Field: higher is better; ties keep entry order
+        lower_is_better = event_type == "Track"
+        
+        # One ordered read; splitting it by gender keeps each list in finishing order
+        results_query = self.supabase.table("results").select(
+            PROJECTIONS["result_ranking"]
+        ).eq("event_id", event_id).order(
+            "result_value", desc=not lower_is_better
+        ).order("result_id").execute()
+        
+        male_results, female_results = [], []
+        for result in results_query.data or []:
+            gender = result["students"]["gender"]
+            if gender == "Male":
+                male_results.append(result)
+            elif gender == "Female":
+                female_results.append(result)
+        if not male_results and not female_results:
+            return
+        
+        payload = []
+        for ranked, point_allocation in ((male_results, male_points), (female_results, female_points)):
+            for i, result in enumerate(ranked):
                 position = i + 1
-                points = female_points.get(str(position), 0)
-                self.supabase.table("results").update({
-                    "position": position,
-                    "points": points
-                }).eq("result_id", result["result_id"]).execute()
-            
-            logger.info(f"Gender-specific positions calculated for event {event_id}: {len(male_results)} male, {len(female_results)} female")
-            
-        except Exception as e:
-            self._handle_database_error("calculate_gender_specific_positions", e)
+                points = point_allocation.get(str(position), 0)
+                if result["position"] != position or result["points"] != points:
+                    # Upsert validates NOT NULL columns on the proposed row, so send the full row
+                    payload.append({
+                        "result_id": result["result_id"],
+                        "bib_id": result["bib_id"],
+                        "event_id": result["event_id"],
+                        "house": result["house"],
+                        "result_value": result["result_value"],
+                        "position": position,
+                        "points": points
+                    })
+        
+        # One request writes every changed row
+        if payload:
+            self.supabase.table("results").upsert(payload, on_conflict="result_id").execute()
+        
+        logger.info(f"Gender-specific positions calculated for event {event_id}: {len(male_results)} male, {len(female_results)} female")
+        
+
+    @_db_op("get_results_by_event", [])
+    def get_results_by_event(self, event_id: int, limit: Optional[int] = None) -> List[Dict]:
+        """An event's results in position order, with student and event details embedded; limit keeps only the top rows"""
+        query = self.supabase.table("results").select(
+            PROJECTIONS["result_detail"]
+        ).eq("event_id", event_id).order("position", desc=False)
+        if limit:
+            query = query.limit(limit)
+        result = query.execute()
+        return result.data or []
 
-    def get_results_by_event(self, event_id: int) -> List[Dict]:
+    def get_all_results(self, as_iter: bool = False) -> Union[List[Dict], Iterator[Dict]]:
+        """All results with student and event details; as_iter=True streams them page by page, uncached"""
+        if as_iter:
+            return self._iter_all_results()
         try:
-            result = self.supabase.table("results").select("""
-                *, 
-                students!inner(bib_id, curtin_id, first_name, last_name, house, gender),
-                events!inner(event_name, event_type, unit, is_relay)
-            """).eq("event_id", event_id).order("position", desc=False).execute()
-            return result.data or []
+            return _cached_all_results(self)
         except Exception as e:
-            self._handle_database_error("get_results_by_event", e)
+            self._handle_database_error("get_all_results", e)
             return []
 
-    def get_all_results(self) -> List[Dict]:
+    @_db_op("get_recent_results", [])
+    def get_recent_results(self, limit: int = 10) -> List[Dict]:
+        """The most recently recorded results, newest first, with student names and event name and unit"""
+        return _cached_recent_results(self, limit)
+
+    def _iter_all_results(self) -> Iterator[Dict]:
         try:
-            result = self.supabase.table("results").select("""
-                *,
-                students!inner(bib_id, curtin_id, first_name, last_name, house, gender),
-                events!inner(event_name, event_type, unit, is_relay)
-            """).order("result_id").execute()
-            return result.data or []
+            yield from self._iter_pages(
+                lambda: self.supabase.table("results").select(PROJECTIONS["result_detail"]).order("result_id")
+            )
         except Exception as e:
             self._handle_database_error("get_all_results", e)
-            return []
 
+    @_db_op("delete_last_result", False, idempotent=False)
     def delete_last_result(self, bib_id: int) -> bool:
         """Delete the most recent result for a student"""
-        try:
+        event_id = None
+        if self._caps.get("delete_last_rpc", True):
+            try:
+                # Find and delete in one statement; returns the affected event
+                event_id = self.supabase.rpc("delete_last_result", {"bib_id_param": int(bib_id)}).execute().data
+            except APIError as e:
+                self._mark_missing("delete_last_rpc", e, _MISSING_FUNCTION_CODES)
+                logger.warning(f"SQL function not available, deleting in two steps: {e}")
+        
+        if not self._caps.get("delete_last_rpc", True):
             # Get the most recent result for this student
-            result = self.supabase.table("results").select("*").eq("bib_id", bib_id).order("result_id", desc=True).limit(1).execute()
-            
-            if not result.data:
-                return False
-                
-            result_to_delete = result.data[0]
-            event_id = result_to_delete["event_id"]
-            
-            # Delete the result
-            delete_result = self.supabase.table("results").delete().eq("result_id", result_to_delete["result_id"]).execute()
-            
-            if delete_result.data:
-                # Recalculate positions for the event
-                self._calculate_gender_specific_positions(event_id)
-                logger.info(f"Last result deleted for bib #{bib_id}")
-                return True
-            return False
-        except Exception as e:
-            self._handle_database_error("delete_last_result", e)
+            result = self.supabase.table("results").select("result_id, event_id").eq("bib_id", bib_id).order("result_id", desc=True).limit(1).execute()
+            if result.data:
+                result_to_delete = result.data[0]
+                delete_result = self.supabase.table("results").delete().eq("result_id", result_to_delete["result_id"]).execute()
+                if delete_result.data:
+                    event_id = result_to_delete["event_id"]
+        
+        if event_id is None:
             return False
+        
+        # Recalculate positions for the event
+        self._calculate_gender_specific_positions(event_id)
+        self._invalidate_scoring_caches()
+        logger.info(f"Last result deleted for bib #{bib_id}")
+        return True
+
+    @_db_op("delete_results_bulk", 0, idempotent=False)
+    def delete_results_bulk(self, result_ids: List[int]) -> int:
+        """Delete several results in one request and re-rank each affected event once"""
+        if not result_ids:
+            return 0
+        
+        # The delete returns the removed rows, so their events come back without a lookup
+        deleted = self.supabase.table("results").delete().in_("result_id", [int(r) for r in result_ids]).execute()
+        rows = deleted.data or []
+        
+        for event_id in {row["event_id"] for row in rows}:
+            self._calculate_gender_specific_positions(event_id)
+        if rows:
+            self._invalidate_scoring_caches()
+        
+        logger.info(f"{len(rows)} results deleted")
+        return len(rows)
+
 
-    #
\ No newline at end of file
+@st.cache_resource(show_spinner=False)
+def get_db() -> DatabaseManager:
+    """The DatabaseManager shared by every page and session in this process"""
+    return DatabaseManager(recalc_on_startup=True)
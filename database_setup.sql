@@ -12,6 +12,7 @@ DROP VIEW IF EXISTS athlete_complete_performance CASCADE;
 DROP VIEW IF EXISTS complete_house_points CASCADE;
 DROP VIEW IF EXISTS corrected_house_points CASCADE;
 DROP VIEW IF EXISTS relay_team_results CASCADE;
+DROP VIEW IF EXISTS event_standings CASCADE;
 
 -- STEP 3: Drop existing foreign key constraints
 ALTER TABLE results DROP CONSTRAINT IF EXISTS results_curtin_id_fkey;
@@ -44,6 +45,16 @@ DELETE FROM results WHERE bib_id IS NULL;
 ALTER TABLE results DROP COLUMN IF EXISTS curtin_id;
 ALTER TABLE results ADD CONSTRAINT results_bib_id_fkey FOREIGN KEY (bib_id) REFERENCES students(bib_id);
 
+-- One result per student per event; keep the earliest entry of any duplicates
+DELETE FROM results r
+USING results d
+WHERE r.bib_id = d.bib_id
+AND r.event_id = d.event_id
+AND r.result_id > d.result_id;
+
+ALTER TABLE results DROP CONSTRAINT IF EXISTS results_bib_event_unique;
+ALTER TABLE results ADD CONSTRAINT results_bib_event_unique UNIQUE (bib_id, event_id);
+
 -- STEP 6: Update events table for gender-specific point allocations
 ALTER TABLE events ADD COLUMN IF NOT EXISTS male_point_allocation JSONB DEFAULT '{"1": 10, "2": 6, "3": 3, "4": 1}';
 ALTER TABLE events ADD COLUMN IF NOT EXISTS female_point_allocation JSONB DEFAULT '{"1": 10, "2": 6, "3": 3, "4": 1}';
@@ -107,97 +118,189 @@ ALTER TABLE relay_teams ADD CONSTRAINT relay_teams_member2_fkey FOREIGN KEY (mem
 ALTER TABLE relay_teams ADD CONSTRAINT relay_teams_member3_fkey FOREIGN KEY (member3_bib_id) REFERENCES students(bib_id);
 ALTER TABLE relay_teams ADD CONSTRAINT relay_teams_member4_fkey FOREIGN KEY (member4_bib_id) REFERENCES students(bib_id);
 
--- STEP 8: Create enhanced recalculation function with gender-specific points
+-- Indexes for the application's hot lookups
+-- results by event: event standings, recalculation and get_results_by_event
+-- (covering the ranking columns so standings can use an index-only scan; it replaces the
+-- plain results_event_id_idx, which IF NOT EXISTS would otherwise leave in place under the old name)
+DROP INDEX IF EXISTS results_event_id_idx;
+CREATE INDEX IF NOT EXISTS results_event_covering_idx ON results(event_id) INCLUDE (bib_id, result_value, position, points);
+-- latest result per student: delete_last_result
+CREATE INDEX IF NOT EXISTS results_bib_result_idx ON results(bib_id, result_id DESC);
+-- relay teams by event: relay standings and relay recalculation (covering; replaces relay_teams_event_id_idx)
+DROP INDEX IF EXISTS relay_teams_event_id_idx;
+CREATE INDEX IF NOT EXISTS relay_teams_event_covering_idx ON relay_teams(event_id) INCLUDE (result_value, position, points);
+-- event lookup by name: get_event_by_name
+CREATE INDEX IF NOT EXISTS events_event_name_idx ON events(event_name);
+-- student list ordering: get_all_students
+CREATE INDEX IF NOT EXISTS students_last_name_idx ON students(last_name);
+
+-- Dirty flag for full recalculation: any change that can move standings sets it,
+-- recalculate_points_by_gender() clears it, and the app only recalculates on startup when set
+CREATE TABLE IF NOT EXISTS meta (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    recalc_needed BOOLEAN NOT NULL DEFAULT TRUE
+);
+INSERT INTO meta (id, recalc_needed) VALUES (1, TRUE) ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION mark_recalc_needed()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE meta SET recalc_needed = TRUE WHERE id = 1 AND NOT recalc_needed;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Position/points columns are not listed, so the SQL recalculation functions never set the flag.
+-- The Python fallback rankers do: their upserts must send full rows (NOT NULL is checked on the
+-- proposed row before ON CONFLICT), so the SET list includes bib_id/event_id/result_value and fires
+-- UPDATE OF. That only costs one extra startup recalculation when the RPCs are not deployed.
+DROP TRIGGER IF EXISTS results_mark_recalc ON results;
+CREATE TRIGGER results_mark_recalc
+    AFTER INSERT OR DELETE OR UPDATE OF bib_id, event_id, result_value ON results
+    FOR EACH STATEMENT EXECUTE FUNCTION mark_recalc_needed();
+
+DROP TRIGGER IF EXISTS relay_teams_mark_recalc ON relay_teams;
+CREATE TRIGGER relay_teams_mark_recalc
+    AFTER INSERT OR DELETE OR UPDATE OF event_id, result_value ON relay_teams
+    FOR EACH STATEMENT EXECUTE FUNCTION mark_recalc_needed();
+
+DROP TRIGGER IF EXISTS events_mark_recalc ON events;
+CREATE TRIGGER events_mark_recalc
+    AFTER INSERT OR DELETE OR UPDATE OF event_type, is_relay, male_point_allocation, female_point_allocation, relay_male_points ON events
+    FOR EACH STATEMENT EXECUTE FUNCTION mark_recalc_needed();
+
+DROP TRIGGER IF EXISTS students_mark_recalc ON students;
+CREATE TRIGGER students_mark_recalc
+    AFTER UPDATE OF gender ON students
+    FOR EACH STATEMENT EXECUTE FUNCTION mark_recalc_needed();
+
+-- STEP 8: Create standings view and enhanced recalculation function with gender-specific points
+-- Positions and points are computed by the database: each event is ranked per gender
+-- (Track: lower is better, Field: higher is better) and points come from the event's
+-- gender-specific allocation. Ties keep insertion order (result_id).
+CREATE OR REPLACE VIEW event_standings AS
+SELECT 
+    ranked.result_id,
+    ranked.event_id,
+    ranked.gender,
+    ranked.position,
+    COALESCE(
+        (
+            CASE 
+                WHEN ranked.gender = 'Male' THEN ranked.male_point_allocation
+                ELSE ranked.female_point_allocation
+            END ->> ranked.position::text
+        )::integer,
+        0
+    ) as points
+FROM (
+    SELECT 
+        r.result_id,
+        r.event_id,
+        s.gender,
+        e.male_point_allocation,
+        e.female_point_allocation,
+        ROW_NUMBER() OVER (
+            PARTITION BY r.event_id, s.gender
+            ORDER BY 
+                CASE 
+                    WHEN e.event_type = 'Track' THEN r.result_value
+                    ELSE -r.result_value 
+                END,
+                r.result_id
+        )::integer as position
+    FROM results r
+    JOIN students s ON r.bib_id = s.bib_id
+    JOIN events e ON r.event_id = e.event_id
+    WHERE e.is_relay = FALSE
+    AND s.gender IN ('Male', 'Female')
+) ranked;
+
 CREATE OR REPLACE FUNCTION recalculate_points_by_gender()
 RETURNS TEXT AS $$
 DECLARE
-    event_record RECORD;
-    result_record RECORD;
-    male_position INTEGER;
-    female_position INTEGER;
-    points_to_assign INTEGER;
-    point_allocation_male JSONB;
-    point_allocation_female JSONB;
     events_processed INTEGER := 0;
     results_updated INTEGER := 0;
+    relays_updated INTEGER := 0;
 BEGIN
-    -- Loop through all events
-    FOR event_record IN 
-        SELECT event_id, event_name, event_type, male_point_allocation, female_point_allocation, is_relay 
-        FROM events 
-        ORDER BY event_name
-    LOOP
-        male_position := 1;
-        female_position := 1;
-        point_allocation_male := event_record.male_point_allocation;
-        point_allocation_female := event_record.female_point_allocation;
-        
-        -- Skip relay events (they use different logic)
-        IF event_record.is_relay = TRUE THEN
-            CONTINUE;
-        END IF;
-        
-        -- Process male results first
-        FOR result_record IN
-            SELECT r.result_id, r.result_value, r.bib_id, s.gender
-            FROM results r
-            JOIN students s ON r.bib_id = s.bib_id
-            WHERE r.event_id = event_record.event_id AND s.gender = 'Male'
-            ORDER BY 
-                CASE 
-                    WHEN event_record.event_type = 'Track' THEN r.result_value
-                    ELSE -r.result_value 
-                END
-        LOOP
-            points_to_assign := COALESCE(
-                (point_allocation_male ->> male_position::text)::integer, 
-                0
-            );
-            
-            UPDATE results 
-            SET 
-                position = male_position, 
-                points = points_to_assign
-            WHERE result_id = result_record.result_id;
-            
-            male_position := male_position + 1;
-            results_updated := results_updated + 1;
-        END LOOP;
-        
-        -- Process female results
-        FOR result_record IN
-            SELECT r.result_id, r.result_value, r.bib_id, s.gender
-            FROM results r
-            JOIN students s ON r.bib_id = s.bib_id
-            WHERE r.event_id = event_record.event_id AND s.gender = 'Female'
-            ORDER BY 
-                CASE 
-                    WHEN event_record.event_type = 'Track' THEN r.result_value
-                    ELSE -r.result_value 
-                END
-        LOOP
-            points_to_assign := COALESCE(
-                (point_allocation_female ->> female_position::text)::integer, 
-                0
-            );
-            
-            UPDATE results 
-            SET 
-                position = female_position, 
-                points = points_to_assign
-            WHERE result_id = result_record.result_id;
-            
-            female_position := female_position + 1;
-            results_updated := results_updated + 1;
-        END LOOP;
-        
-        events_processed := events_processed + 1;
-    END LOOP;
+    -- Apply the computed standings in a single set-based update, touching only changed rows
+    UPDATE results r
+    SET 
+        position = es.position,
+        points = es.points
+    FROM event_standings es
+    WHERE r.result_id = es.result_id
+    AND (r.position IS DISTINCT FROM es.position OR r.points IS DISTINCT FROM es.points);
+    
+    GET DIAGNOSTICS results_updated = ROW_COUNT;
+    
+    -- Relay teams compete together regardless of gender, fastest time first,
+    -- scored from the event's relay allocation
+    UPDATE relay_teams rt
+    SET 
+        position = ranked.position,
+        points = ranked.points
+    FROM (
+        SELECT 
+            team_id,
+            position,
+            COALESCE((relay_points ->> position::text)::integer, 0) as points
+        FROM (
+            SELECT 
+                t.team_id,
+                COALESCE(e.relay_male_points, '{"1": 15, "2": 9, "3": 5, "4": 3}'::jsonb) as relay_points,
+                ROW_NUMBER() OVER (PARTITION BY t.event_id ORDER BY t.result_value, t.team_id)::integer as position
+            FROM relay_teams t
+            JOIN events e ON t.event_id = e.event_id
+            WHERE t.result_value > 0
+        ) ordered
+    ) ranked
+    WHERE rt.team_id = ranked.team_id
+    AND (rt.position IS DISTINCT FROM ranked.position OR rt.points IS DISTINCT FROM ranked.points);
     
-    RETURN 'SUCCESS: Updated ' || results_updated || ' results across ' || events_processed || ' events with gender-specific points';
+    GET DIAGNOSTICS relays_updated = ROW_COUNT;
+    
+    UPDATE meta SET recalc_needed = FALSE WHERE id = 1;
+    
+    SELECT COUNT(*) INTO events_processed FROM events;
+    
+    RETURN 'SUCCESS: Updated ' || results_updated || ' results and ' || relays_updated || ' relay teams across ' || events_processed || ' events with gender-specific points';
+END;
+$$ LANGUAGE plpgsql;
+
+-- Per-event recalculation used after each result entry/deletion (one round-trip from the app)
+CREATE OR REPLACE FUNCTION recalculate_event_positions(event_id_param INTEGER)
+RETURNS INTEGER AS $$
+DECLARE
+    results_updated INTEGER := 0;
+BEGIN
+    UPDATE results r
+    SET 
+        position = es.position,
+        points = es.points
+    FROM event_standings es
+    WHERE es.event_id = event_id_param
+    AND r.result_id = es.result_id
+    AND (r.position IS DISTINCT FROM es.position OR r.points IS DISTINCT FROM es.points);
+    
+    GET DIAGNOSTICS results_updated = ROW_COUNT;
+    RETURN results_updated;
 END;
 $$ LANGUAGE plpgsql;
 
+-- Delete a student's most recent result in one statement; returns the event to re-rank (NULL if none)
+CREATE OR REPLACE FUNCTION delete_last_result(bib_id_param INTEGER)
+RETURNS INTEGER AS $$
+    DELETE FROM results
+    WHERE result_id = (
+        SELECT result_id FROM results
+        WHERE bib_id = bib_id_param
+        ORDER BY result_id DESC
+        LIMIT 1
+    )
+    RETURNING event_id;
+$$ LANGUAGE sql;
+
 -- STEP 9: Recreate corrected house points view with new schema
 CREATE OR REPLACE VIEW corrected_house_points AS
 SELECT 
@@ -328,6 +431,15 @@ LEFT JOIN (
 ) rel ON s.bib_id = rel.bib_id
 ORDER BY total_individual_points DESC NULLS LAST;
 
+-- Best male and female athlete in one query
+CREATE OR REPLACE FUNCTION best_athletes_by_gender()
+RETURNS SETOF athlete_complete_performance AS $$
+    SELECT DISTINCT ON (gender) *
+    FROM athlete_complete_performance
+    WHERE gender IN ('Male', 'Female')
+    ORDER BY gender, total_individual_points DESC, individual_gold DESC;
+$$ LANGUAGE sql STABLE;
+
 -- STEP 12: Update relay team validation function
 CREATE OR REPLACE FUNCTION validate_relay_team_members(
     member1_id INTEGER,
@@ -1,53 +1,60 @@
 """Fixed Event Entry with No Recursion Issues"""
 
 import streamlit as st
-from database import DatabaseManager
+import pandas as pd
+from database import DatabaseManager, ResultEntryError, get_db
 from utils import (
     validate_bib_id, 
     parse_time_input,
+    format_time_for_display,
     validate_time_input,
     display_success_message, 
     display_error_message,
-    display_warning_message
+    display_warning_message,
+    fetch_parallel,
+    fragment
 )
 
 def show_event_entry():
     """Main event entry interface"""
     st.header("Event Entry & Results")
     
-    # Initialize database manager
-    if "db_manager" not in st.session_state:
-        try:
-            st.session_state.db_manager = DatabaseManager()
-        except Exception as e:
-            st.error(f"Database connection failed: {str(e)}")
-            st.info("Please check your database connection and try refreshing the page.")
-            return
-    
-    db = st.session_state.db_manager
+    try:
+        db = get_db()
+    except Exception as e:
+        st.error(f"Database connection failed: {str(e)}")
+        st.info("Please check your database connection and try refreshing the page.")
+        return
     
     # Check if system is properly set up
     if not verify_system_setup(db):
         return
     
+    show_result_entry_panel(db)
+
+@fragment
+def show_result_entry_panel(db: DatabaseManager):
+    """Result entry form and the recent results it feeds, rerun together without the rest of the page"""
     # Main result entry form
     show_result_entry_form(db)
     
-    # Show recent results
+    # Show recent results; drawn after the form so a result recorded in this run is already listed
     st.markdown("---")
     show_recent_results(db)
 
 def verify_system_setup(db: DatabaseManager):
     """Verify that the system is properly set up"""
     try:
+        data = fetch_parallel(students=db.get_all_students, events=db.get_all_events)
+        
         # Check if we have students
-        students = db.get_all_students()
+        students = data["students"]
         if not students:
             st.warning("No students found in database. Please add students first.")
             return False
         
         # Check if we have events
-        events = db.get_all_events()
+        events = data["events"]
         if not events:
             st.warning("No events found in database. Please add events first.")
             if st.button("Initialize Basic Events"):
@@ -61,27 +68,22 @@ def verify_system_setup(db: DatabaseManager):
         st.error(f"System setup verification failed: {str(e)}")
         return False
 
+# Starter events offered when the database has none; they take add_event's default point allocations
+BASIC_EVENTS = (
+    {"name": "100m Sprint", "type": "Track", "unit": "time", "is_relay": False},
+    {"name": "Long Jump", "type": "Field", "unit": "meters", "is_relay": False},
+    {"name": "4x100m Relay", "type": "Track", "unit": "time", "is_relay": True},
+)
+
 def initialize_basic_events(db: DatabaseManager):
     """Initialize basic events for testing"""
-    basic_events = [
-        {"name": "100m Sprint", "type": "Track", "unit": "time", "is_relay": False},
-        {"name": "Long Jump", "type": "Field", "unit": "meters", "is_relay": False},
-        {"name": "4x100m Relay", "type": "Track", "unit": "time", "is_relay": True},
-    ]
-    
-    for event_info in basic_events:
+    for event_info in BASIC_EVENTS:
         try:
-            is_relay = event_info["is_relay"]
-            male_points = {"1": 15, "2": 9, "3": 5, "4": 3} if is_relay else {"1": 10, "2": 6, "3": 3, "4": 1}
-            female_points = {"1": 15, "2": 9, "3": 5, "4": 3} if is_relay else {"1": 10, "2": 6, "3": 3, "4": 1}
-            
             db.add_event(
                 event_name=event_info["name"],
                 event_type=event_info["type"],
                 unit=event_info["unit"],
-                is_relay=is_relay,
-                male_points=male_points,
-                female_points=female_points
+                is_relay=event_info["is_relay"]
             )
         except Exception as e:
             st.error(f"Failed to add {event_info['name']}: {str(e)}")
@@ -90,8 +92,8 @@ def show_result_entry_form(db: DatabaseManager):
     """Display form to record event results"""
     st.subheader("Record Event Result")
 
-    # Student search panel
-    with st.container():
+    # Student search panel; the form keeps typing from rerunning the page, so the lookup runs once per Search
+    with st.form("bib_search_form"):
         st.markdown("### Student Search")
 
         bib_id_input = st.text_input(
@@ -99,14 +101,16 @@ def show_result_entry_form(db: DatabaseManager):
             placeholder="Enter student's bib number",
             key="result_entry_bib"
         )
+        searched = st.form_submit_button("Search")
 
-        if bib_id_input and validate_bib_id(bib_id_input):
+    if searched and bib_id_input:
+        if not validate_bib_id(bib_id_input):
+            display_error_message("Please enter a valid Bib ID")
+            st.session_state.student_info = None
+        else:
             try:
-                student_info = db.get_student_by_bib(int(bib_id_input))
-                if student_info:
-                    st.session_state.student_info = student_info
-                else:
-                    st.session_state.student_info = None
+                st.session_state.student_info = db.get_student_by_bib(int(bib_id_input))
+                if not st.session_state.student_info:
                     display_error_message(f"No student found with Bib ID {bib_id_input}")
             except Exception as e:
                 display_error_message(f"Error searching for student: {str(e)}")
@@ -144,12 +148,14 @@ def show_result_entry_form(db: DatabaseManager):
                 display_warning_message("No events available.")
                 return
             
-            event_names = [event['event_name'] for event in events]
-            selected_event_name = st.selectbox("Select Event", event_names)
+            # One dict serves both the options and the lookup; a repeated name keeps its first event, as before
+            events_by_name = {}
+            for event in events:
+                events_by_name.setdefault(event['event_name'], event)
+            selected_event_name = st.selectbox("Select Event", list(events_by_name))
             
             if selected_event_name:
-                selected_event = next(e for e in events if e['event_name'] == selected_event_name)
-                display_event_form(db, student_info, selected_event)
+                display_event_form(db, student_info, events_by_name[selected_event_name])
                 
         except Exception as e:
             display_error_message(f"Error loading events: {str(e)}")
@@ -164,26 +170,36 @@ def display_event_form(db: DatabaseManager, student_info: dict, event: dict):
         gender = student_info.get('gender', 'Unknown')
         st.info(f"**Competition Category:** {gender} - This athlete will compete against other {gender.lower()} athletes")
 
+    # The input keeps what was typed until the result is saved; only then does the callback clear it
+    input_key = "result_entry_time" if event['unit'] == 'time' else "result_entry_distance"
+
     with st.form("result_entry_form"):
         # Input based on event type
         if event['unit'] == 'time':
-            result_input = st.text_input(
+            st.text_input(
                 "Time",
                 placeholder="e.g., 12.34 or 1:23.45",
-                help="Enter time in seconds (12.34) or minutes:seconds (1:23.45)"
+                help="Enter time in seconds (12.34) or minutes:seconds (1:23.45)",
+                key=input_key
             )
         else:
-            result_input = st.number_input(
+            st.number_input(
                 "Distance (meters)",
                 min_value=0.0,
                 format="%.2f",
                 step=0.01,
-                help="Enter distance in meters"
+                help="Enter distance in meters",
+                key=input_key
             )
 
         col1, col2 = st.columns(2)
         with col1:
-            submitted = st.form_submit_button("Submit Result", type="primary")
+            st.form_submit_button(
+                "Submit Result",
+                type="primary",
+                on_click=submit_result,
+                args=(db, student_info, event, input_key)
+            )
         with col2:
             delete_last = st.form_submit_button("Delete Last Result")
 
@@ -192,83 +208,92 @@ def display_event_form(db: DatabaseManager, student_info: dict, event: dict):
                 success = db.delete_last_result(student_info["bib_id"])
                 if success:
                     display_success_message("Last result deleted successfully!")
-                    st.rerun()
                 else:
                     display_error_message("No results found to delete for this student.")
             except Exception as e:
                 display_error_message(f"Error deleting result: {str(e)}")
 
-        if submitted:
-            try:
-                # Validate and process input
-                if event['unit'] == 'time':
-                    if not result_input or not validate_time_input(result_input):
-                        display_error_message("Please enter a valid time format")
-                        return
-                    processed_result = parse_time_input(result_input)
-                else:
-                    if result_input is None or result_input <= 0:
-                        display_error_message("Please enter a valid distance greater than 0")
-                        return
-                    processed_result = float(result_input)
+        # Outcome of the submit callback that ran before this rerun
+        outcome = st.session_state.pop("result_entry_outcome", None)
+        if outcome:
+            level, message = outcome
+            if level == "success":
+                display_success_message(message)
+            else:
+                display_error_message(message)
+                if level == "exception":
+                    st.info("Common issues: Student may already have a result for this event, or database constraints.")
 
-                # Add result to database
-                success = db.add_result(
-                    bib_id=student_info["bib_id"],
-                    event_id=event['event_id'],
-                    result_value=processed_result
-                )
+def submit_result(db: DatabaseManager, student_info: dict, event: dict, input_key: str):
+    """Submit callback for the result form: record the result, and clear the input only once it is saved.
+    Runs before the rerun, which is the only point where a widget's value may still be changed."""
+    result_input = st.session_state.get(input_key)
+    try:
+        # Validate and process input
+        if event['unit'] == 'time':
+            if not result_input or not validate_time_input(result_input):
+                st.session_state.result_entry_outcome = ("error", "Please enter a valid time format")
+                return
+            processed_result = parse_time_input(result_input)
+        else:
+            if result_input is None or result_input <= 0:
+                st.session_state.result_entry_outcome = ("error", "Please enter a valid distance greater than 0")
+                return
+            processed_result = float(result_input)
 
-                if success:
-                    display_success_message(f"Result recorded successfully!")
-                    st.rerun()
-                else:
-                    display_error_message("Failed to record result.")
-                    
-            except Exception as e:
-                display_error_message(f"Error recording result: {str(e)}")
-                st.info("Common issues: Student may already have a result for this event, or database constraints.")
+        # Add result to database; a rejection comes back as ResultEntryError with the reason
+        db.add_result(
+            bib_id=student_info["bib_id"],
+            event_id=event['event_id'],
+            result_value=processed_result
+        )
+        st.session_state[input_key] = "" if event['unit'] == 'time' else 0.0
+        st.session_state.result_entry_outcome = ("success", "Result recorded successfully!")
+            
+    except ResultEntryError as e:
+        st.session_state.result_entry_outcome = ("error", str(e))
+    except Exception as e:
+        st.session_state.result_entry_outcome = ("exception", f"Error recording result: {str(e)}")
 
 def show_recent_results(db: DatabaseManager):
     """Show recent results for verification"""
     try:
         st.markdown("### Recent Results")
-        results = db.get_all_results()
+        recent_results = db.get_recent_results(limit=5)
         
-        if not results:
+        if not recent_results:
             st.info("No results recorded yet.")
             return
         
-        # Show last 5 results
-        recent_results = results[-5:] if len(results) > 5 else results
-        
-        for result in reversed(recent_results):
+        # Newest first, as one table
+        rows = []
+        for result in recent_results:
             try:
-                student_data = result.get('students', {})
-                event_data = result.get('events', {})
+                # Inner joins: every row carries exactly one student and one event object
+                student_data = result['students']
+                event_data = result['events']
                 
-                # Handle list format from Supabase joins
-                if isinstance(student_data, list):
-                    student_data = student_data[0] if student_data else {}
-                if isinstance(event_data, list):
-                    event_data = event_data[0] if event_data else {}
-                
-                student_name = f"{student_data.get('first_name', 'Unknown')} {student_data.get('last_name', '')}"
-                event_name = event_data.get('event_name', 'Unknown Event')
                 result_value = result.get('result_value', 0)
-                position = result.get('position', 'N/A')
-                points = result.get('points', 0)
                 
-                # Format result value
+                # Format result value; times over a minute read as M:SS.ss, like the entry form accepts
                 if event_data.get('unit') == 'time':
-                    formatted_result = f"{result_value:.2f}s"
+                    formatted_result = format_time_for_display(result_value)
                 else:
                     formatted_result = f"{result_value:.2f}m"
                 
-                st.write(f"**{student_name}** - {event_name}: {formatted_result} (Pos: {position}, Points: {points})")
+                rows.append({
+                    "Name": f"{student_data.get('first_name', 'Unknown')} {student_data.get('last_name', '')}",
+                    "Event": event_data.get('event_name', 'Unknown Event'),
+                    "Result": formatted_result,
+                    "Position": result.get('position', 'N/A'),
+                    "Points": result.get('points', 0)
+                })
                 
             except Exception as e:
                 st.write(f"Error displaying result: {str(e)}")
+        
+        if rows:
+            st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
                 
     except Exception as e:
         st.error(f"Error loading recent results: {str(e)}")
\ No newline at end of file
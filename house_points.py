@@ -4,7 +4,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from database import DatabaseManager
+from database import get_db
 from config import HOUSES, HOUSE_COLORS
 from utils import (
     create_house_points_dataframe,
@@ -16,11 +16,7 @@ def show_house_points():
     """Display house points leaderboard with corrected calculations"""
     st.header("🏆 House Points Leaderboard")
     
-    # Initialize database manager
-    if "db_manager" not in st.session_state:
-        st.session_state.db_manager = DatabaseManager()
-    
-    db = st.session_state.db_manager
+    db = get_db()
     
     # Create tabs for different views
     tab1, tab2, tab3, tab4 = st.tabs(["🏆 Leaderboard", "📊 Analytics", "🎯 Detailed Breakdown", "⚡ Manual Refresh"])
\ No newline at end of file
@@ -6,13 +6,14 @@ Updated to include Relay Team Management
 import streamlit as st
 import os
 from config import PAGE_CONFIG
+from utils import fetch_parallel
 
 # Configure page FIRST before any other Streamlit commands
 st.set_page_config(**PAGE_CONFIG)
 
 # Import database after page config
 try:
-    from database import DatabaseManager
+    from database import get_db
     DATABASE_AVAILABLE = True
 except ImportError as e:
     st.error(f"Database import failed: {e}")
@@ -185,20 +186,22 @@ def main():
             st.info("Advanced analytics features coming soon!")
             
             # For now, show a summary
-            if "db_manager" not in st.session_state:
-                st.session_state.db_manager = DatabaseManager()
+            db = get_db()
             
-            db = st.session_state.db_manager
+            # Quick stats; the three reads are independent, so fetch them together
+            data = fetch_parallel(
+                students=db.get_all_students,
+                events=db.get_all_events,
+                results=db.get_all_results
+            )
+            students, events, results = data["students"], data["events"], data["results"]
             
-            # Quick stats
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                students = db.get_all_students()
                 st.metric("Total Students", len(students))
             
             with col2:
-                events = db.get_all_events()
                 individual_events = [e for e in events if not e.get('is_relay', False)]
                 st.metric("Individual Events", len(individual_events))
             
@@ -207,7 +210,6 @@ def main():
                 st.metric("Relay Events", len(relay_events))
             
             with col4:
-                results = db.get_all_results()
                 st.metric("Total Results", len(results))
             
     except Exception as e:
@@ -155,16 +155,10 @@ def test_gender_specific_scoring():
     try:
         db = DatabaseManager(recalc_on_startup=False)
         
-        # Get sample results
-        results = db.get_all_results()
-        if not results:
-            print("  ⚠️ No results found - cannot test scoring")
-            return True
-        
-        # Group results by event and gender
+        # Group results by event and gender, streaming them page by page
         events_tested = {}
         
-        for result in results:
+        for result in db.get_all_results(as_iter=True):
             event_id = result.get('event_id')
             student_data = result.get('students', {})
             if isinstance(student_data, list):
@@ -182,6 +176,10 @@ def test_gender_specific_scoring():
                 'points': points
             })
         
+        if not events_tested:
+            print("  ⚠️ No results found - cannot test scoring")
+            return True
+        
         # Analyze scoring patterns
         for event_id, gender_results in events_tested.items():
             event_name = "Unknown Event"
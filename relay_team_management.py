@@ -3,7 +3,8 @@ Updated Relay Team Management Interface - Using Bib ID as Primary Key
 """
 
 import streamlit as st
-from database import DatabaseManager
+from collections import defaultdict
+from database import DatabaseManager, get_db
 from config import HOUSES
 from utils import (
     validate_time_input, 
@@ -15,15 +16,13 @@ from utils import (
 )
 import pandas as pd
 
+GENDER_ICONS = {"Male": "👨", "Female": "👩", "Other": "🧑"}
+
 def show_relay_team_management():
     """Display relay team management interface using bib IDs"""
     st.header("🏃‍♂️🏃‍♀️ Relay Team Management")
     
-    # Initialize database manager
-    if "db_manager" not in st.session_state:
-        st.session_state.db_manager = DatabaseManager()
-    
-    db = st.session_state.db_manager
+    db = get_db()
     
     # Gender-mixed relay info
     st.info("**Relay Team Rules:** Teams can be mixed-gender and compete together in a single category. All relay events use the same point system (1st=15pts, 2nd=9pts, 3rd=5pts, 4th=3pts)")
@@ -86,17 +85,23 @@ def show_relay_team_registration(db: DatabaseManager):
             member3_bib = st.text_input("Member 3 Bib ID", placeholder="103")
             member4_bib = st.text_input("Member 4 Bib ID", placeholder="104")
         
+        # Validate and look up each Bib ID once; the validation area and the submit checks share the results
+        member_lookups = []
+        for bib in (member1_bib, member2_bib, member3_bib, member4_bib):
+            bib = bib.strip()
+            bib_number = int(bib) if bib and validate_bib_id(bib) else None
+            student = db.get_student_by_bib(bib_number) if bib_number is not None else None
+            member_lookups.append((bib, bib_number, student))
+        
         # Member validation area
-        if member1_bib or member2_bib or member3_bib or member4_bib:
+        if any(bib for bib, _, _ in member_lookups):
             st.markdown("#### Member Validation")
-            member_bibs = [member1_bib, member2_bib, member3_bib, member4_bib]
             valid_members = []
             
-            for i, bib in enumerate(member_bibs, 1):
-                if bib and validate_bib_id(bib):
-                    student = db.get_student_by_bib(int(bib))
+            for i, (bib, bib_number, student) in enumerate(member_lookups, 1):
+                if bib_number is not None:
                     if student:
-                        gender_icon = {"Male": "👨", "Female": "👩", "Other": "🧑"}.get(student.get('gender'), "🧑")
+                        gender_icon = GENDER_ICONS.get(student.get('gender'), "🧑")
                         st.success(f"Member {i}: {student['first_name']} {student['last_name']} ({gender_icon} {student.get('gender', 'Unknown')}) - {student['house']} House")
                         valid_members.append(student)
                     else:
@@ -121,24 +126,19 @@ def show_relay_team_registration(db: DatabaseManager):
             if not team_name.strip():
                 errors.append("Please enter a team name")
             
-            member_bibs = [member1_bib, member2_bib, member3_bib, member4_bib]
-            
             # Validate all member Bib IDs
             valid_bib_ids = []
-            for i, bib in enumerate(member_bibs, 1):
-                if not bib.strip():
+            for i, (bib, bib_number, student) in enumerate(member_lookups, 1):
+                if not bib:
                     errors.append(f"Please enter Bib ID for Member {i}")
-                elif not validate_bib_id(bib):
+                elif bib_number is None:
                     errors.append(f"Invalid Bib ID format for Member {i}")
+                elif not student:
+                    errors.append(f"No student found with Bib ID {bib}")
+                elif student['house'] != house:
+                    errors.append(f"Member {i} ({student['first_name']} {student['last_name']}) is not in {house} House")
                 else:
-                    # Check if student exists
-                    student = db.get_student_by_bib(int(bib))
-                    if not student:
-                        errors.append(f"No student found with Bib ID {bib}")
-                    elif student['house'] != house:
-                        errors.append(f"Member {i} ({student['first_name']} {student['last_name']}) is not in {house} House")
-                    else:
-                        valid_bib_ids.append(int(bib))
+                    valid_bib_ids.append(bib_number)
             
             # Check for duplicate members
             if len(set(valid_bib_ids)) != 4:
@@ -190,12 +190,14 @@ def show_relay_result_entry(db: DatabaseManager):
             display_warning_message("No teams registered for this event.")
             return
         
-        # Team selector
-        selected_team = st.selectbox(
+        # Team selector; labels are built once and the box picks by index
+        team_labels = [f"{team.get('team_name', 'Unknown')} ({team.get('house', 'Unknown')} House)" for team in teams]
+        team_index = st.selectbox(
             "Select Team",
-            options=teams,
-            format_func=lambda x: f"{x.get('team_name', 'Unknown')} ({x.get('house', 'Unknown')} House)"
+            options=range(len(teams)),
+            format_func=team_labels.__getitem__
         )
+        selected_team = teams[team_index] if team_index is not None else None
         
         if selected_team:
             with st.form("relay_result_entry"):
@@ -350,15 +352,19 @@ def show_relay_standings(db: DatabaseManager):
         display_warning_message("No relay events found.")
         return
     
+    # Fetch every relay event's teams in one query
+    teams_by_event = defaultdict(list)
+    for team in db.get_relay_teams_by_events([event['event_id'] for event in relay_events]):
+        teams_by_event[team['event_id']].append(team)
+    
     # Calculate relay points by house
-    house_relay_points = {}
+    house_relay_points = defaultdict(int)
     
     for event in relay_events:
-        teams = db.get_relay_teams_by_event(event['event_id'])
+        teams = teams_by_event.get(event['event_id'], [])
         for team in teams:
             if team.get('points', 0) > 0:
-                house = team.get('house', 'Unknown')
-                house_relay_points[house] = house_relay_points.get(house, 0) + team.get('points', 0)
+                house_relay_points[team.get('house', 'Unknown')] += team['points']
     
     if house_relay_points:
         # Create standings dataframe
@@ -403,7 +409,7 @@ def show_relay_standings(db: DatabaseManager):
         st.subheader("Event Breakdown")
         for event in relay_events:
             with st.expander(f"📊 {event['event_name']} Results"):
-                teams = db.get_relay_teams_by_event(event['event_id'])
+                teams = teams_by_event.get(event['event_id'], [])
                 if teams and any(t.get('result_value') for t in teams):
                     event_results = []
                     for team in teams:
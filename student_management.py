@@ -1,7 +1,7 @@
 """Fixed Student Management Page with proper error handling for new schema"""
 
 import streamlit as st
-from database import DatabaseManager
+from database import DatabaseManager, get_db
 from config import HOUSES, GENDER_OPTIONS
 from utils import (
     validate_curtin_id, 
@@ -17,11 +17,7 @@ def show_student_management():
     """Display enhanced student management interface with gender"""
     st.header("👥 Student Management")
     
-    # Initialize database manager
-    if "db_manager" not in st.session_state:
-        st.session_state.db_manager = DatabaseManager()
-    
-    db = st.session_state.db_manager
+    db = get_db()
     
     # Create tabs for different student operations
     tab1, tab2, tab3, tab4 = st.tabs(["➕ Add Student", "🔍 Search Student", "📋 All Students", "🏆 Top Athletes"])
@@ -95,7 +91,9 @@ def show_add_student_form(db: DatabaseManager):
             if not curtin_id or not validate_curtin_id(curtin_id):
                 errors.append("Please enter a valid 8-digit Curtin ID")
             
-            if not bib_id or not validate_bib_id(bib_id):
+            # Parse the Bib ID once; None when it is missing or invalid
+            bib_number = int(bib_id) if bib_id and validate_bib_id(bib_id) else None
+            if bib_number is None:
                 errors.append("Please enter a valid Bib ID (positive integer)")
             
             if not first_name.strip():
@@ -105,7 +103,7 @@ def show_add_student_form(db: DatabaseManager):
                 errors.append("Please enter last name")
             
             # Check if student already exists
-            existing_student = db.get_student_by_bib(int(bib_id)) if validate_bib_id(bib_id) else None
+            existing_student = db.get_student_by_bib(bib_number) if bib_number is not None else None
             if existing_student:
                 errors.append(f"Student with Bib ID {bib_id} already exists")
             
@@ -116,7 +114,7 @@ def show_add_student_form(db: DatabaseManager):
                 # Add student to database with gender
                 success = db.add_student(
                     curtin_id=curtin_id,
-                    bib_id=int(bib_id),
+                    bib_id=bib_number,
                     first_name=first_name.strip(),
                     last_name=last_name.strip(),
                     house=house,
@@ -2,9 +2,22 @@
 
 import pandas as pd
 import streamlit as st
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import re
 
+# Worker threads need the script run context to use st.* (errors, caches)
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:
+    add_script_run_ctx = None
+    get_script_run_ctx = None
+
+# st.fragment reruns only the decorated function when its own widgets change;
+# older Streamlit releases only have the experimental name, or neither
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
 def format_time_for_display(seconds: float) -> str:
     """Convert seconds to MM:SS.ms format for display"""
     if seconds < 60:
@@ -61,18 +74,17 @@ def validate_distance_input(distance_str: str) -> bool:
     except ValueError:
         return False
 
+_CURTIN_ID_RE = re.compile(r'^\d{8}$')
+
 def validate_curtin_id(curtin_id: str) -> bool:
     """Validate Curtin ID format (8 digits)"""
-    pattern = r'^\d{8}$'
-    return bool(re.match(pattern, curtin_id))
+    return bool(_CURTIN_ID_RE.match(curtin_id))
 
 def validate_bib_id(bib_id: str) -> bool:
     """Validate Bib ID (should be a positive integer)"""
-    try:
-        num = int(bib_id)
-        return num > 0
-    except ValueError:
-        return False
+    # str.isdecimal rejects signs, decimals and blanks without raising; int() accepts what it passes
+    bib_id = str(bib_id).strip()
+    return bib_id.isdecimal() and int(bib_id) > 0
 
 def validate_point_allocation(point_allocation: Dict) -> bool:
     """Validate point allocation dictionary"""
@@ -85,17 +97,21 @@ def validate_point_allocation(point_allocation: Dict) -> bool:
     except:
         return False
 
+# Event name fragments checked by the helpers below
+_SPRINT_DISTANCES = ('100m', '200m', '400m')
+_RELAY_KEYWORDS = ('relay', '4x', '4 x')
+
 def get_time_input_placeholder(event_name: str) -> str:
     """Get appropriate placeholder text for time input based on event"""
-    if any(distance in event_name for distance in ['100m', '200m', '400m']):
+    if any(distance in event_name for distance in _SPRINT_DISTANCES):
         return "e.g., 12.34 (seconds)"
     else:
         return "e.g., 1:23.45 (MM:SS.ms)"
 
 def is_relay_event(event_name: str) -> bool:
     """Check if an event is a relay event"""
-    relay_keywords = ['relay', '4x', '4 x']
-    return any(keyword in event_name.lower() for keyword in relay_keywords)
+    name = event_name.lower()
+    return any(keyword in name for keyword in _RELAY_KEYWORDS)
 
 def display_success_message(message: str):
     """Display a success message with custom styling"""
@@ -175,6 +191,9 @@ def create_house_points_dataframe(house_points: List[Dict]) -> pd.DataFrame:
     
     return pd.DataFrame(df_data)
 
+# Medal shown for the first three places
+_RANK_EMOJIS = ("🥇", "🥈", "🥉")
+
 def create_metric_cards(house_points: List[Dict]):
     """Create metric cards for house points display"""
     if not house_points:
@@ -186,7 +205,7 @@ def create_metric_cards(house_points: List[Dict]):
     
     for i, house_data in enumerate(house_points):
         with cols[i]:
-            rank_emoji = {1: "🥇", 2: "🥈", 3: "🥉"}.get(i + 1, "🏆")
+            rank_emoji = _RANK_EMOJIS[i] if i < len(_RANK_EMOJIS) else "🏆"
             st.metric(
                 label=f"{rank_emoji} {house_data['house']} House",
                 value=f"{house_data['total_points']} pts",
@@ -226,4 +245,19 @@ def export_athletes_to_csv(athletes: List[Dict], filename: str = "athlete_perfor
         return None
     
     df = create_athlete_performance_dataframe(athletes)
-    return df.to_csv(index=False)
\ No newline at end of file
+    return df.to_csv(index=False)
+
+def fetch_parallel(**fns: Callable[[], Any]) -> Dict[str, Any]:
+    """Run independent database reads concurrently and return their results by keyword"""
+    if not fns:
+        return {}
+    
+    ctx = get_script_run_ctx() if get_script_run_ctx else None
+    
+    def attach_ctx():
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+    
+    with ThreadPoolExecutor(max_workers=len(fns), initializer=attach_ctx) as executor:
+        futures = {name: executor.submit(fn) for name, fn in fns.items()}
+        return {name: future.result() for name, future in futures.items()}